@@ -73,22 +73,30 @@ type NotFoundError struct {
 	entityName     string
 	identifierName string
 	identifier     interface{}
+	// quoteIdentifier defers quoting of string identifiers to Error so that
+	// constructing the error, which happens on every failed lookup, does no
+	// formatting work of its own.
+	quoteIdentifier bool
 }
 
 func (e *NotFoundError) Error() string {
 	if !e.hasDetails {
 		return "unable to find user or group"
 	}
+	if e.quoteIdentifier {
+		return fmt.Sprintf("unable to find %v with %v %q", e.entityName, e.identifierName, e.identifier)
+	}
 	return fmt.Sprintf("unable to find %v with %v %v", e.entityName, e.identifierName, e.identifier)
 }
 
 // UsernameNotFound returns a NotFoundError for a missing user searched by name.
 func UsernameNotFound(name string) error {
 	return &NotFoundError{
-		hasDetails:     true,
-		entityName:     "user",
-		identifierName: "name",
-		identifier:     fmt.Sprintf("\"%v\"", name),
+		hasDetails:      true,
+		entityName:      "user",
+		identifierName:  "name",
+		identifier:      name,
+		quoteIdentifier: true,
 	}
 }
 
@@ -106,10 +114,11 @@ func UIDNotFound(uid uint32) error {
 // name.
 func GroupNameNotFound(name string) error {
 	return &NotFoundError{
-		hasDetails:     true,
-		entityName:     "group",
-		identifierName: "name",
-		identifier:     fmt.Sprintf("\"%v\"", name),
+		hasDetails:      true,
+		entityName:      "group",
+		identifierName:  "name",
+		identifier:      name,
+		quoteIdentifier: true,
 	}
 }
 
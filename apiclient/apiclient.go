@@ -21,6 +21,7 @@ import (
 	"net/http"
 	"path"
 	"strings"
+	"sync"
 	"time"
 
 	"golang.org/x/oauth2"
@@ -62,13 +63,27 @@ type Config struct {
 type googleAPIClient struct {
 	config  *Config
 	service *cua.Service
+	// mu guards the cached metadata values below.
+	mu       sync.Mutex
+	project  string
+	zone     string
+	instance string
 }
 
 // New creates a new APIClient with the provided configuration.
 func New(config *Config) (APIClient, error) {
+	// A single long-lived transport keeps idle connections to the API open
+	// so repeated refreshes reuse one TCP and TLS session instead of
+	// redoing the handshakes on every request.
 	service, err := cua.New(&http.Client{
-		Transport: &oauth2.Transport{Source: google.ComputeTokenSource("")},
-		Timeout:   config.Timeout,
+		Transport: &oauth2.Transport{
+			Source: google.ComputeTokenSource(""),
+			Base: &http.Transport{
+				Proxy:               http.ProxyFromEnvironment,
+				MaxIdleConnsPerHost: 4,
+			},
+		},
+		Timeout: config.Timeout,
 	})
 	if err != nil {
 		return nil, err
@@ -125,20 +140,42 @@ func (c *googleAPIClient) AuthorizedKeys(username string) (*cua.AuthorizedKeysVi
 	}
 }
 
+// instanceInfo returns the project, zone, and fully-qualified instance URL for
+// this VM. The values cannot change for the lifetime of the VM, so they are
+// fetched from the metadata server once and cached for subsequent calls. The
+// three fetches are independent, so the first call issues them concurrently
+// and completes in the time of the slowest request rather than the sum.
 func (c *googleAPIClient) instanceInfo() (project, zone, instance string, err error) {
+	c.mu.Lock()
+	defer c.mu.Unlock()
+	if c.project != "" {
+		return c.project, c.zone, c.instance, nil
+	}
+	var name string
+	var zoneErr, nameErr error
+	var wg sync.WaitGroup
+	wg.Add(2)
+	go func() {
+		defer wg.Done()
+		zone, zoneErr = metadata.Zone()
+	}()
+	go func() {
+		defer wg.Done()
+		name, nameErr = metadata.InstanceName()
+	}()
 	project, err = metadata.ProjectID()
-	if err != nil {
-		return
+	wg.Wait()
+	if err == nil {
+		err = zoneErr
 	}
-	zone, err = metadata.Zone()
-	if err != nil {
-		return
+	if err == nil {
+		err = nameErr
 	}
-	name, err := metadata.InstanceName()
 	if err != nil {
-		return
+		return "", "", "", err
 	}
 	instancePath := path.Join("projects", project, "zones", zone, "instances", name)
 	instance = strings.TrimRight(c.config.InstanceBase, "/") + "/" + instancePath
+	c.project, c.zone, c.instance = project, zone, instance
 	return
 }
@@ -15,8 +15,8 @@
 package main
 
 import (
-	"fmt"
 	"os"
+	"strings"
 
 	"github.com/GoogleCloudPlatform/compute-user-accounts/logger"
 	"github.com/GoogleCloudPlatform/compute-user-accounts/server"
@@ -31,7 +31,9 @@ func main() {
 	if err != nil {
 		logger.Fatalf("Authorized keys command failed: %v.", err)
 	}
-	for _, k := range keys {
-		fmt.Println(k)
+	// Write all keys with a single syscall; sshd runs this command on every
+	// login and stdout is an unbuffered pipe.
+	if len(keys) > 0 {
+		os.Stdout.WriteString(strings.Join(keys, "\n") + "\n")
 	}
 }
@@ -40,10 +40,12 @@ var (
 
 	apiBase      = flag.String("clouduseraccounts", "https://www.googleapis.com/clouduseraccounts/vm_beta/", "the URL to the base of the clouduseraccounts API")
 	instanceBase = flag.String("compute", "https://www.googleapis.com/compute/v1/", "the URL to the base of the compute API")
+	debug        = flag.Bool("debug", false, "enable debug level logging")
 )
 
 func main() {
 	flag.Parse()
+	logger.SetDebugEnabled(*debug)
 	logger.Info("Starting daemon.")
 	interrupt := make(chan os.Signal, 1)
 	signal.Notify(interrupt, os.Interrupt, os.Kill, syscall.SIGTERM)
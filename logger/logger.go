@@ -25,6 +25,17 @@ import (
 
 var writer *syslog.Writer
 
+// debugEnabled gates debug level messages. It is off by default so hot paths
+// skip formatting messages that production syslog configurations would drop
+// anyway.
+var debugEnabled = false
+
+// SetDebugEnabled enables or disables debug level logging. It must be called
+// before other goroutines are started.
+func SetDebugEnabled(enabled bool) {
+	debugEnabled = enabled
+}
+
 func init() {
 	// The default level for logging done in other packages is error.
 	var err error
@@ -35,6 +46,22 @@ func init() {
 	log.SetOutput(writer)
 }
 
+// Debug logs a debug level message to the syslog if debug logging is enabled.
+func Debug(a ...interface{}) {
+	if !debugEnabled {
+		return
+	}
+	writer.Debug(fmt.Sprint(a...))
+}
+
+// Debugf logs a debug level message to the syslog if debug logging is enabled.
+func Debugf(format string, a ...interface{}) {
+	if !debugEnabled {
+		return
+	}
+	writer.Debug(fmt.Sprintf(format, a...))
+}
+
 // Info logs an info level message to the syslog.
 func Info(a ...interface{}) {
 	writer.Info(fmt.Sprint(a...))
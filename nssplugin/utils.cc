@@ -16,7 +16,6 @@
 #include "utils.h"  // NOLINT(build/include)
 
 #include <errno.h>
-#include <fcntl.h>
 #include <stdio.h>
 #include <sys/select.h>
 #include <sys/socket.h>
@@ -244,14 +243,12 @@ void GetDaemonOutput(const std::string& command,
     throw std::runtime_error(LOCATION);
   }
   strncpy(address.sun_path, SOCKET_PATH, sizeof(address.sun_path));
-  AutoFd fd(socket(AF_UNIX, SOCK_STREAM, 0));
+  // Request non-blocking mode and close-on-exec at creation rather than with
+  // a separate fcntl() round trip after the fact.
+  AutoFd fd(socket(AF_UNIX, SOCK_STREAM | SOCK_NONBLOCK | SOCK_CLOEXEC, 0));
   if (fd.get() == -1) {
     throw std::runtime_error(LOCATION);
   }
-  // Set the socket to be non-blocking.
-  if (fcntl(fd.get(), F_SETFL, O_NONBLOCK)) {
-    throw std::runtime_error(LOCATION);
-  }
   errno = 0;
   int ret = connect(fd.get(), reinterpret_cast<sockaddr*>(&address),
                     sizeof(address));
@@ -261,8 +258,14 @@ void GetDaemonOutput(const std::string& command,
     throw std::runtime_error(LOCATION);
   }
 
-  size_t bytes_written = write(fd.get(), command.c_str(), command.size());
-  if (bytes_written != command.size()) {
+  // Requests are newline-terminated so the daemon can frame a command
+  // without relying on a single read returning it whole.
+  std::string framed = command;
+  if (framed.empty() || framed[framed.size() - 1] != '\n') {
+    framed += '\n';
+  }
+  size_t bytes_written = write(fd.get(), framed.c_str(), framed.size());
+  if (bytes_written != framed.size()) {
     throw std::runtime_error(LOCATION);
   }
 
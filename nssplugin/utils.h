@@ -115,7 +115,8 @@ uint32_t ParseId(const std::string& value);
 // stdout is appended to the output_lines vector with trailing newline
 // characters removed.
 //
-// Command must end with a trailing newline character.
+// A trailing newline character is appended to the command before it is sent
+// if the command does not already end with one.
 //
 // Throws std::invalid_argument exception if execution succeeds, but returns
 // result code 404. Throws std::runtime_error exception if execution fails,
@@ -15,9 +15,11 @@
 package server
 
 import (
+	"bufio"
+	"bytes"
 	"errors"
 	"fmt"
-	"io/ioutil"
+	"io"
 	"net"
 	"strconv"
 	"strings"
@@ -139,7 +141,9 @@ func send(req string, extendTimeout bool) ([]string, error) {
 	defer conn.Close()
 	writeDeadline := time.Now().Add(clientTimeout)
 	conn.SetWriteDeadline(writeDeadline)
-	_, err = conn.Write([]byte(req))
+	// Requests are newline-terminated so the server can detect the end of a
+	// command without depending on a single read returning it whole.
+	_, err = conn.Write([]byte(req + "\n"))
 	if err != nil {
 		logger.Errorf("Failed to write request: %v.", err)
 		return nil, err
@@ -149,25 +153,34 @@ func send(req string, extendTimeout bool) ([]string, error) {
 		readDeadline = time.Now().Add(extendedTimeout)
 	}
 	conn.SetReadDeadline(readDeadline)
-	data, err := ioutil.ReadAll(conn)
-	if err != nil {
+	// Check the status line before reading the payload so error responses
+	// return without materializing a body that would only be discarded.
+	reader := bufio.NewReaderSize(conn, 4096)
+	header, err := reader.ReadString('\n')
+	if err != nil && err != io.EOF {
 		logger.Errorf("Failed to read response: %v.", err)
 		return nil, err
 	}
-	resp := strings.Split(string(data), "\n")
-	err = checkHeader(resp)
-	if err != nil {
+	if err := checkHeader(strings.TrimSuffix(header, "\n")); err != nil {
 		logger.Errorf("Request failed: %v.", err)
 		return nil, err
 	}
-	return resp[1:], nil
+	// Presize the buffer so typical responses are read without the
+	// repeated grow-and-copy cycles of starting from an empty buffer.
+	var buf bytes.Buffer
+	buf.Grow(4096)
+	if _, err := buf.ReadFrom(reader); err != nil {
+		logger.Errorf("Failed to read response: %v.", err)
+		return nil, err
+	}
+	if buf.Len() == 0 {
+		return []string{}, nil
+	}
+	return strings.Split(buf.String(), "\n"), nil
 }
 
-func checkHeader(resp []string) error {
-	if len(resp) == 0 {
-		return errors.New("incomplete response")
-	}
-	switch resp[0] {
+func checkHeader(header string) error {
+	switch header {
 	case "200":
 		return nil
 	case "404":
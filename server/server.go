@@ -17,11 +17,13 @@
 package server
 
 import (
+	"bufio"
 	"bytes"
 	"errors"
-	"fmt"
+	"io"
 	"net"
 	"os"
+	"regexp"
 	"strconv"
 	"strings"
 	"time"
@@ -30,7 +32,12 @@ import (
 	"github.com/GoogleCloudPlatform/compute-user-accounts/logger"
 )
 
-const maxRequestSize = 128
+const (
+	maxRequestSize = 128
+	// maxConcurrentRequests bounds the number of connections handled at
+	// once; further connections queue in the listen backlog.
+	maxConcurrentRequests = 64
+)
 
 var (
 	// socketPath is set through the Makefile at compile time.
@@ -41,6 +48,20 @@ var (
 	serverTimeout     = time.Second
 )
 
+// namePattern matches valid user and group names. It is compiled once at
+// startup so that name arguments can be validated locally; a name that
+// cannot match any account is answered as not found without a provider
+// round trip.
+var namePattern = regexp.MustCompile("^[a-z][-a-z0-9_]{0,31}$")
+
+// Preencoded status lines for responses with no body.
+var (
+	status200 = []byte("200")
+	status400 = []byte("400")
+	status404 = []byte("404")
+	status500 = []byte("500")
+)
+
 // A Server provides account information to a Client through a socket.
 type Server struct {
 	Provider accounts.AccountProvider
@@ -57,14 +78,19 @@ func (s *Server) Serve() error {
 	os.Chmod(socketPath, os.ModePerm)
 	listeningCallback()
 	logger.Infof("Listening for connections at %v.", socketPath)
+	sem := make(chan struct{}, maxConcurrentRequests)
 	for {
 		conn, err := sock.Accept()
 		if err != nil {
 			logger.Errorf("Failed to accept connection: %v.", err)
 			continue
 		}
-		logger.Info("Accepted connection.")
-		go s.handle(conn)
+		logger.Debug("Accepted connection.")
+		sem <- struct{}{}
+		go func(conn net.Conn) {
+			defer func() { <-sem }()
+			s.handle(conn)
+		}(conn)
 	}
 }
 
@@ -72,26 +98,52 @@ func (s *Server) handle(conn net.Conn) {
 	defer conn.Close()
 	deadline := time.Now().Add(serverTimeout)
 	conn.SetReadDeadline(deadline)
-	data := make([]byte, maxRequestSize)
-	n, err := conn.Read(data)
+	req, err := readRequest(conn)
 	if err != nil {
 		logger.Errorf("Failed to read request: %v.", err)
 		return
 	}
-	resp := s.respond(string(data[:n]))
+	resp := s.respond(req)
 	deadline = time.Now().Add(serverTimeout)
 	conn.SetWriteDeadline(deadline)
-	_, err = conn.Write([]byte(resp))
+	_, err = conn.Write(resp)
 	if err != nil {
 		logger.Errorf("Failed to write response: %v.", err)
 	}
-	logger.Info("Request completed.")
+	logger.Debug("Request completed.")
 }
 
-func (s *Server) respond(req string) string {
-	parts := strings.Split(req, " ")
-	cmd := parts[0]
-	args := parts[1:]
+// readRequest reads a single newline-terminated request from conn, looping
+// over short reads from the socket. A request terminated by EOF instead of a
+// newline is also accepted so that clients which close their write side after
+// sending remain supported.
+func readRequest(conn net.Conn) (string, error) {
+	reader := bufio.NewReaderSize(conn, maxRequestSize)
+	line, err := reader.ReadSlice('\n')
+	if err == nil {
+		line = line[:len(line)-1]
+	} else if err == io.EOF && len(line) > 0 {
+		err = nil
+	}
+	if err != nil {
+		return "", err
+	}
+	return string(line), nil
+}
+
+func (s *Server) respond(req string) []byte {
+	// Split out the command and the first argument without building a slice
+	// of every space-separated token; requests carry at most one argument.
+	cmd := req
+	var args []string
+	if i := strings.IndexByte(req, ' '); i != -1 {
+		cmd = req[:i]
+		arg := req[i+1:]
+		if j := strings.IndexByte(arg, ' '); j != -1 {
+			arg = arg[:j]
+		}
+		args = []string{arg}
+	}
 	switch cmd {
 	case "user_by_name":
 		return s.userByName(args)
@@ -113,40 +165,42 @@ func (s *Server) respond(req string) string {
 		return s.authorizedKeys(args)
 	default:
 		logger.Errorf("Invalid request: %v.", req)
-		return "400"
+		return status400
 	}
 }
 
-func (s *Server) userByName(args []string) string {
+func (s *Server) userByName(args []string) []byte {
 	name, err := parseName(args)
-	if err != nil {
+	if _, ok := err.(*accounts.NotFoundError); ok {
+		return marshalError(err)
+	} else if err != nil {
 		logger.Errorf("Invalid name for user: %v.", err)
-		return "400"
+		return status400
 	}
-	logger.Infof("Getting user by name: %v.", name)
+	logger.Debugf("Getting user by name: %v.", name)
 	user, err := s.Provider.UserByName(name)
 	if err != nil {
 		return marshalError(err)
 	}
-	return fmt.Sprintf("200\n%v", marshalUser(user))
+	return []byte("200\n" + marshalUser(user))
 }
 
-func (s *Server) userByUID(args []string) string {
+func (s *Server) userByUID(args []string) []byte {
 	uid, err := parseID(args)
 	if err != nil {
 		logger.Errorf("Invalid UID for user: %v.", err)
-		return "400"
+		return status400
 	}
-	logger.Infof("Getting user by UID: %v.", uid)
+	logger.Debugf("Getting user by UID: %v.", uid)
 	user, err := s.Provider.UserByUID(uid)
 	if err != nil {
 		return marshalError(err)
 	}
-	return fmt.Sprintf("200\n%v", marshalUser(user))
+	return []byte("200\n" + marshalUser(user))
 }
 
-func (s *Server) users() string {
-	logger.Info("Getting users.")
+func (s *Server) users() []byte {
+	logger.Debug("Getting users.")
 	users, err := s.Provider.Users()
 	if err != nil {
 		return marshalError(err)
@@ -157,39 +211,41 @@ func (s *Server) users() string {
 		buf.WriteString("\n")
 		buf.WriteString(marshalUser(u))
 	}
-	return buf.String()
+	return buf.Bytes()
 }
 
-func (s *Server) groupByName(args []string) string {
+func (s *Server) groupByName(args []string) []byte {
 	name, err := parseName(args)
-	if err != nil {
+	if _, ok := err.(*accounts.NotFoundError); ok {
+		return marshalError(err)
+	} else if err != nil {
 		logger.Errorf("Invalid name for group: %v.", err)
-		return "400"
+		return status400
 	}
-	logger.Infof("Getting group by name: %v.", name)
+	logger.Debugf("Getting group by name: %v.", name)
 	group, err := s.Provider.GroupByName(name)
 	if err != nil {
 		return marshalError(err)
 	}
-	return fmt.Sprintf("200\n%v", marshalGroup(group))
+	return []byte("200\n" + marshalGroup(group))
 }
 
-func (s *Server) groupByGID(args []string) string {
+func (s *Server) groupByGID(args []string) []byte {
 	gid, err := parseID(args)
 	if err != nil {
 		logger.Errorf("Invalid GID for group: %v.", err)
-		return "400"
+		return status400
 	}
-	logger.Infof("Getting group by GID: %v.", gid)
+	logger.Debugf("Getting group by GID: %v.", gid)
 	group, err := s.Provider.GroupByGID(gid)
 	if err != nil {
 		return marshalError(err)
 	}
-	return fmt.Sprintf("200\n%v", marshalGroup(group))
+	return []byte("200\n" + marshalGroup(group))
 }
 
-func (s *Server) groups() string {
-	logger.Info("Getting groups.")
+func (s *Server) groups() []byte {
+	logger.Debug("Getting groups.")
 	groups, err := s.Provider.Groups()
 	if err != nil {
 		return marshalError(err)
@@ -200,11 +256,11 @@ func (s *Server) groups() string {
 		buf.WriteString("\n")
 		buf.WriteString(marshalGroup(g))
 	}
-	return buf.String()
+	return buf.Bytes()
 }
 
-func (s *Server) names() string {
-	logger.Info("Getting names.")
+func (s *Server) names() []byte {
+	logger.Debug("Getting names.")
 	names, err := s.Provider.Names()
 	if err != nil {
 		return marshalError(err)
@@ -215,35 +271,39 @@ func (s *Server) names() string {
 		buf.WriteString("\n")
 		buf.WriteString(n)
 	}
-	return buf.String()
+	return buf.Bytes()
 }
 
-func (s *Server) isName(args []string) string {
+func (s *Server) isName(args []string) []byte {
 	name, err := parseName(args)
-	if err != nil {
+	if _, ok := err.(*accounts.NotFoundError); ok {
+		return marshalError(err)
+	} else if err != nil {
 		logger.Errorf("Invalid name: %v.", err)
-		return "400"
+		return status400
 	}
-	logger.Infof("Checking name: %v.", name)
+	logger.Debugf("Checking name: %v.", name)
 	is, err := s.Provider.IsName(name)
 	if err != nil {
 		return marshalError(err)
 	} else if is {
-		logger.Info("Valid name.")
-		return "200"
+		logger.Debug("Valid name.")
+		return status200
 	} else {
-		logger.Info("Invalid name.")
-		return "404"
+		logger.Debug("Invalid name.")
+		return status404
 	}
 }
 
-func (s *Server) authorizedKeys(args []string) string {
+func (s *Server) authorizedKeys(args []string) []byte {
 	username, err := parseName(args)
-	if err != nil {
+	if _, ok := err.(*accounts.NotFoundError); ok {
+		return marshalError(err)
+	} else if err != nil {
 		logger.Errorf("Invalid username for keys: %v.", err)
-		return "400"
+		return status400
 	}
-	logger.Infof("Getting keys for user: %v.", username)
+	logger.Debugf("Getting keys for user: %v.", username)
 	keys, err := s.Provider.AuthorizedKeys(username)
 	if err != nil {
 		return marshalError(err)
@@ -254,13 +314,19 @@ func (s *Server) authorizedKeys(args []string) string {
 		buf.WriteString("\n")
 		buf.WriteString(k)
 	}
-	return buf.String()
+	return buf.Bytes()
 }
 
 func parseName(args []string) (string, error) {
 	if len(args) == 0 {
 		return "", errors.New("no args")
 	}
+	if !namePattern.MatchString(args[0]) {
+		// Names that cannot match any account, such as system accounts
+		// probed through every NSS module, are lookup misses rather than
+		// malformed requests.
+		return "", &accounts.NotFoundError{}
+	}
 	return args[0], nil
 }
 
@@ -272,25 +338,25 @@ func parseID(args []string) (uint32, error) {
 	return uint32(val), err
 }
 
-func marshalError(err error) string {
+func marshalError(err error) []byte {
 	switch err.(type) {
 	case *accounts.NotFoundError:
 		logger.Noticef("Request failed: %v.", err)
-		return "404"
+		return status404
 	default:
 		logger.Noticef("Request failed: %v.", err)
-		return "500"
+		return status500
 	}
 }
 
 func marshalUser(user *accounts.User) string {
 	uid := strconv.FormatUint(uint64(user.UID), 10)
 	gid := strconv.FormatUint(uint64(user.GID), 10)
-	return strings.Join([]string{user.Name, uid, gid, user.Gecos, user.HomeDirectory, user.Shell}, ":")
+	return user.Name + ":" + uid + ":" + gid + ":" + user.Gecos + ":" + user.HomeDirectory + ":" + user.Shell
 }
 
 func marshalGroup(group *accounts.Group) string {
 	mem := strings.Join(group.Members, ",")
 	gid := strconv.FormatUint(uint64(group.GID), 10)
-	return strings.Join([]string{group.Name, gid, mem}, ":")
+	return group.Name + ":" + gid + ":" + mem
 }
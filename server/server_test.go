@@ -258,6 +258,29 @@ func TestIncompleteRequests(t *testing.T) {
 	}
 }
 
+func TestInvalidNames(t *testing.T) {
+	socketPath = tempFile()
+	mock := &testbase.MockProvider{Usrs: testbase.ExpUsers, Grps: testbase.ExpGroups, Nams: testbase.ExpNames, Keys: testbase.ExpKeys}
+	startServer(mock)
+	defer os.Remove(socketPath)
+	// Names that cannot match any account, such as system accounts probed
+	// through every NSS module, must be reported as not found rather than
+	// as failed requests.
+	testData := []string{
+		"user_by_name _apt",
+		"user_by_name Debian-exim",
+		"group_by_name -dash",
+		"is_name root!",
+		"keys _apt",
+	}
+	for _, req := range testData {
+		_, err := send(req, false)
+		if _, ok := err.(*accounts.NotFoundError); !ok {
+			t.Errorf(`send("%v", false) = (_, %v); want NotFoundError`, req, err)
+		}
+	}
+}
+
 func TestClientTimeout(t *testing.T) {
 	var defaultClientTimeout, defaultExtendedTimeout time.Duration
 	defaultClientTimeout, clientTimeout = clientTimeout, time.Nanosecond
@@ -33,6 +33,11 @@ const (
 	sudoersGroupGID  = 4001
 )
 
+// maxKeyRefreshWorkers bounds the number of concurrent authorized keys
+// fetches during a scheduled refresh, so a large user list is worked through
+// in batches rather than fanned out as one API request per user at once.
+const maxKeyRefreshWorkers = 8
+
 // These are mocked in tests.
 var (
 	timeNow   = time.Now
@@ -75,6 +80,21 @@ type cachingStore struct {
 	usersByUID    map[uint32]*cachedUser
 	groupsByName  map[string]*accounts.Group
 	groupsByGID   map[uint32]*accounts.Group
+	// userList, groupList and nameList are flat views of the maps above,
+	// rebuilt on refresh so that listing requests copy a prebuilt slice
+	// instead of walking the maps on every call. nameList excludes the
+	// sudoers group name, which Names appends.
+	userList  []*accounts.User
+	groupList []*accounts.Group
+	nameList  []string
+	// nameSet holds the names in nameList for membership checks, so IsName
+	// costs a single map lookup instead of one per account type.
+	nameSet map[string]bool
+	// missingUsers records names that were still absent after an on-demand
+	// refresh, so that repeated lookups for a nonexistent user do not each
+	// block on another refresh round trip. Entries expire after the account
+	// refresh cooldown and the map is dropped on a successful refresh.
+	missingUsers map[string]time.Time
 }
 
 // New returns an AccountProvider implemented as an in-memory store.
@@ -92,7 +112,13 @@ func New(apiClient apiclient.APIClient, config *Config) accounts.AccountProvider
 }
 
 func nowOutsideTimespan(start time.Time, duration time.Duration) bool {
-	now := timeNow()
+	return outsideTimespan(timeNow(), start, duration)
+}
+
+// outsideTimespan reports whether now falls outside the timespan beginning at
+// start and lasting for duration. Callers checking many timespans should
+// capture the clock once and use this instead of nowOutsideTimespan.
+func outsideTimespan(now, start time.Time, duration time.Duration) bool {
 	end := start.Add(duration)
 	return now.Before(start) || now.After(end)
 }
@@ -123,13 +149,14 @@ func updateAccounts(s *cachingStore) {
 		logger.Errorf("Failed refresh: %v.", err)
 		return
 	}
-	s.Lock()
-	defer s.Unlock()
-	oldUsers := s.usersByName
-	s.usersByName = make(map[string]*cachedUser)
-	s.usersByUID = make(map[uint32]*cachedUser)
-	s.groupsByName = make(map[string]*accounts.Group)
-	s.groupsByGID = make(map[uint32]*accounts.Group)
+	// Convert the API views and build the new maps, presized from the view
+	// counts, before taking the write lock so that lookups stay unblocked
+	// while the cache is rebuilt. Only the carry-over of cached key state
+	// and the final swap run under the lock.
+	usersByName := make(map[string]*cachedUser, len(users))
+	usersByUID := make(map[uint32]*cachedUser, len(users))
+	userList := make([]*accounts.User, 0, len(users))
+	nameList := make([]string, 0, len(users)+len(groups))
 	for _, u := range users {
 		user := &accounts.User{
 			Name:          u.Username,
@@ -140,23 +167,47 @@ func updateAccounts(s *cachingStore) {
 			Shell:         u.Shell,
 		}
 		cu := &cachedUser{user: user}
-		if old, ok := oldUsers[user.Name]; ok {
-			cu.keyRefreshTime = old.keyRefreshTime
-			cu.keys = old.keys
-			cu.sudoer = old.sudoer
-		}
-		s.usersByName[user.Name] = cu
-		s.usersByUID[user.UID] = cu
+		usersByName[user.Name] = cu
+		usersByUID[user.UID] = cu
+		userList = append(userList, user)
+		nameList = append(nameList, user.Name)
 	}
+	groupsByName := make(map[string]*accounts.Group, len(groups))
+	groupsByGID := make(map[uint32]*accounts.Group, len(groups))
+	groupList := make([]*accounts.Group, 0, len(groups))
 	for _, g := range groups {
 		group := &accounts.Group{
 			Name:    g.GroupName,
 			GID:     uint32(g.Gid),
 			Members: g.Members,
 		}
-		s.groupsByName[group.Name] = group
-		s.groupsByGID[group.GID] = group
+		groupsByName[group.Name] = group
+		groupsByGID[group.GID] = group
+		groupList = append(groupList, group)
+		nameList = append(nameList, group.Name)
+	}
+	nameSet := make(map[string]bool, len(nameList))
+	for _, n := range nameList {
+		nameSet[n] = true
 	}
+	s.Lock()
+	defer s.Unlock()
+	for name, cu := range usersByName {
+		if old, ok := s.usersByName[name]; ok {
+			cu.keyRefreshTime = old.keyRefreshTime
+			cu.keys = old.keys
+			cu.sudoer = old.sudoer
+		}
+	}
+	s.usersByName = usersByName
+	s.usersByUID = usersByUID
+	s.groupsByName = groupsByName
+	s.groupsByGID = groupsByGID
+	s.userList = userList
+	s.groupList = groupList
+	s.nameList = nameList
+	s.nameSet = nameSet
+	s.missingUsers = nil
 	logger.Info("Refreshing users and groups succeeded.")
 }
 
@@ -167,19 +218,30 @@ func updateKeys(s *cachingStore) {
 		err  error
 		time time.Time
 	}
+	names := keysRequiringRefresh(s)
+	workers := maxKeyRefreshWorkers
+	if len(names) < workers {
+		workers = len(names)
+	}
+	work := make(chan string)
 	ch := make(chan update)
-	workers := 0
-	for _, name := range keysRequiringRefresh(s) {
-		go func(n string) {
-			view, err := s.apiClient.AuthorizedKeys(n)
-			ch <- update{n, view, err, timeNow()}
-		}(name)
-		workers += 1
+	for i := 0; i < workers; i++ {
+		go func() {
+			for n := range work {
+				view, err := s.apiClient.AuthorizedKeys(n)
+				ch <- update{n, view, err, timeNow()}
+			}
+		}()
 	}
-	refreshedKeys := make([]update, workers)
-	for workers != 0 {
+	go func() {
+		for _, n := range names {
+			work <- n
+		}
+		close(work)
+	}()
+	refreshedKeys := make([]update, 0, len(names))
+	for i := 0; i < len(names); i++ {
 		up := <-ch
-		workers -= 1
 		if up.err != nil {
 			logger.Errorf("Failed key refresh for %v: %v.", up.name, up.err)
 			continue
@@ -201,10 +263,11 @@ func updateKeys(s *cachingStore) {
 
 func keysRequiringRefresh(s *cachingStore) []string {
 	var result []string
+	now := timeNow()
 	s.RLock()
 	defer s.RUnlock()
 	for name, cu := range s.usersByName {
-		if nowOutsideTimespan(cu.keyRefreshTime, s.config.KeyRefreshFrequency) {
+		if outsideTimespan(now, cu.keyRefreshTime, s.config.KeyRefreshFrequency) {
 			result = append(result, name)
 		}
 	}
@@ -218,11 +281,33 @@ func (s *cachingStore) userByNameImpl(name string) (*cachedUser, bool) {
 	return cu, ok
 }
 
-// UserByName satisfies AccountProvider.
-func (s *cachingStore) UserByName(name string) (*accounts.User, error) {
+func (s *cachingStore) recentlyMissing(name string) bool {
+	s.RLock()
+	defer s.RUnlock()
+	missTime, ok := s.missingUsers[name]
+	return ok && !nowOutsideTimespan(missTime, s.config.AccountRefreshCooldown)
+}
+
+func (s *cachingStore) markMissing(name string) {
+	s.Lock()
+	defer s.Unlock()
+	if s.missingUsers == nil {
+		s.missingUsers = make(map[string]time.Time)
+	}
+	s.missingUsers[name] = timeNow()
+}
+
+// cachedUserByName looks up a cached user, triggering a blocking refresh if
+// the name is missing and has not missed recently. A name still missing after
+// the refresh is marked so later lookups skip the refresh round trip.
+func (s *cachingStore) cachedUserByName(name string) (*cachedUser, bool) {
 	cu, ok := s.userByNameImpl(name)
 	if ok {
-		return cu.user, nil
+		return cu, true
+	}
+	if s.recentlyMissing(name) {
+		logger.Infof("User %v recently missed; skipping refresh.", name)
+		return nil, false
 	}
 	ch := make(chan struct{})
 	logger.Infof("Triggering refresh due to missing user %v.", name)
@@ -231,9 +316,19 @@ func (s *cachingStore) UserByName(name string) (*accounts.User, error) {
 	<-ch
 	cu, ok = s.userByNameImpl(name)
 	if ok {
-		return cu.user, nil
+		return cu, true
 	}
-	return nil, accounts.UsernameNotFound(name)
+	s.markMissing(name)
+	return nil, false
+}
+
+// UserByName satisfies AccountProvider.
+func (s *cachingStore) UserByName(name string) (*accounts.User, error) {
+	cu, ok := s.cachedUserByName(name)
+	if !ok {
+		return nil, accounts.UsernameNotFound(name)
+	}
+	return cu.user, nil
 }
 
 // UserByName satisfies AccountProvider.
@@ -251,12 +346,9 @@ func (s *cachingStore) UserByUID(uid uint32) (*accounts.User, error) {
 func (s *cachingStore) Users() ([]*accounts.User, error) {
 	s.RLock()
 	defer s.RUnlock()
-	ret := make([]*accounts.User, len(s.usersByName))
-	i := 0
-	for _, cu := range s.usersByName {
-		ret[i] = cu.user
-		i++
-	}
+	// Copy the memoized list so callers can reorder the result freely.
+	ret := make([]*accounts.User, len(s.userList))
+	copy(ret, s.userList)
 	return ret, nil
 }
 
@@ -295,13 +387,11 @@ func (s *cachingStore) GroupByGID(gid uint32) (*accounts.Group, error) {
 func (s *cachingStore) Groups() ([]*accounts.Group, error) {
 	s.RLock()
 	defer s.RUnlock()
-	ret := make([]*accounts.Group, len(s.groupsByName)+1)
-	i := 0
-	for _, g := range s.groupsByName {
-		ret[i] = g
-		i++
-	}
-	ret[i] = s.sudoersGroup()
+	// The sudoers group is derived from mutable key data, so it is built on
+	// demand and appended to a copy of the memoized list.
+	ret := make([]*accounts.Group, len(s.groupList)+1)
+	copy(ret, s.groupList)
+	ret[len(ret)-1] = s.sudoersGroup()
 	return ret, nil
 }
 
@@ -309,17 +399,9 @@ func (s *cachingStore) Groups() ([]*accounts.Group, error) {
 func (s *cachingStore) Names() ([]string, error) {
 	s.RLock()
 	defer s.RUnlock()
-	ret := make([]string, len(s.usersByName)+len(s.groupsByName)+1)
-	i := 0
-	for u := range s.usersByName {
-		ret[i] = u
-		i++
-	}
-	for g := range s.groupsByName {
-		ret[i] = g
-		i++
-	}
-	ret[i] = sudoersGroupName
+	ret := make([]string, len(s.nameList)+1)
+	copy(ret, s.nameList)
+	ret[len(ret)-1] = sudoersGroupName
 	return ret, nil
 }
 
@@ -330,16 +412,12 @@ func (s *cachingStore) IsName(name string) (bool, error) {
 	}
 	s.RLock()
 	defer s.RUnlock()
-	_, ok1 := s.usersByName[name]
-	_, ok2 := s.groupsByName[name]
-	return ok1 || ok2, nil
+	return s.nameSet[name], nil
 }
 
 // AuthorizedKeys satisfies AccountProvider.
 func (s *cachingStore) AuthorizedKeys(username string) ([]string, error) {
-	// Call UserByName first to trigger refresh if the user is missing.
-	s.UserByName(username)
-	cu, ok := s.userByNameImpl(username)
+	cu, ok := s.cachedUserByName(username)
 	if !ok {
 		return nil, accounts.UsernameNotFound(username)
 	} else if !nowOutsideTimespan(cu.keyRefreshTime, s.config.KeyRefreshCooldown) {
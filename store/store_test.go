@@ -35,10 +35,13 @@ type mockAPIClient struct {
 	keys             map[string][]string
 	sudoers          map[string]bool
 	keysError        error
+	// usersGroupsCalls counts UsersAndGroups round trips.
+	usersGroupsCalls int
 }
 
 // UsersAndGroups satisfies APIClient.
 func (c *mockAPIClient) UsersAndGroups() ([]*cua.LinuxUserView, []*cua.LinuxGroupView, error) {
+	c.usersGroupsCalls++
 	return c.users, c.groups, c.usersGroupsError
 }
 
@@ -287,10 +290,15 @@ func TestKeyPrewarmingAndCaching(t *testing.T) {
 
 func TestKeyCooldownAndRefresh(t *testing.T) {
 	mTime := time.Now().UTC()
-	// Mock time.
+	// Mock time. Restore the real clocks even if a case fails so later
+	// tests never run against the frozen time.
 	timeNow = func() time.Time { return mTime }
 	pulse := make(chan time.Time)
 	timeAfter = func(time.Duration) <-chan time.Time { return pulse }
+	defer func() {
+		timeAfter = time.After
+		timeNow = time.Now
+	}()
 	mock := newMock()
 	config := &Config{
 		AccountRefreshFrequency: time.Hour,
@@ -322,8 +330,6 @@ func TestKeyCooldownAndRefresh(t *testing.T) {
 			[]string{"key1"},
 		},
 	})
-	timeAfter = time.After
-	timeNow = time.Now
 }
 
 func TestUserOnDemandRefresh(t *testing.T) {
@@ -387,6 +393,46 @@ func TestGroupOnDemandRefresh(t *testing.T) {
 	})
 }
 
+func TestMissingUserCooldown(t *testing.T) {
+	mTime := time.Now().UTC()
+	// Mock time. Restore the real clock even if a case fails so later
+	// tests never run against the frozen time.
+	timeNow = func() time.Time { return mTime }
+	defer func() { timeNow = time.Now }()
+	mock := newMock()
+	config := &Config{
+		AccountRefreshFrequency: time.Hour,
+		AccountRefreshCooldown:  time.Second,
+		KeyRefreshFrequency:     time.Hour,
+		KeyRefreshCooldown:      0,
+	}
+	store := testStore(mock, config)
+	missingCase := &testbase.FailureCase{
+		`UserByName("nil")`,
+		func() (interface{}, error) { return store.UserByName("nil") },
+		`unable to find user with name "nil"`,
+	}
+	// Move outside the cooldown of the initial refresh so the first missing
+	// lookup triggers an on-demand refresh.
+	mTime = mTime.Add(time.Second + time.Nanosecond)
+	calls := mock.usersGroupsCalls
+	testbase.RunCases(t, []testbase.TestCase{missingCase})
+	if mock.usersGroupsCalls != calls+1 {
+		t.Errorf("first missing lookup made %v refresh calls; want 1", mock.usersGroupsCalls-calls)
+	}
+	// A second lookup during the cooldown must skip the refresh round trip.
+	testbase.RunCases(t, []testbase.TestCase{missingCase})
+	if mock.usersGroupsCalls != calls+1 {
+		t.Errorf("lookup during cooldown made %v refresh calls; want 0", mock.usersGroupsCalls-calls-1)
+	}
+	// Once the cooldown elapses, the missing name is retried.
+	mTime = mTime.Add(time.Second + time.Nanosecond)
+	testbase.RunCases(t, []testbase.TestCase{missingCase})
+	if mock.usersGroupsCalls != calls+2 {
+		t.Errorf("lookup after cooldown made %v refresh calls; want 1", mock.usersGroupsCalls-calls-1)
+	}
+}
+
 func TestEmptyUsersGroups(t *testing.T) {
 	emptyMock := &mockAPIClient{}
 	config := &Config{time.Hour, time.Hour, time.Hour, 0}